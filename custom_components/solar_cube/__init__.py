@@ -18,8 +18,12 @@ from homeassistant.components.frontend import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_NAME, CONF_TOKEN, CONF_URL
-from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_CLOSE,
+    EVENT_HOMEASSISTANT_STARTED,
+)
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util.yaml import Secrets, load_yaml_dict
@@ -33,15 +37,14 @@ from .const import (
     CONF_ORG,
     CONF_RUN_FRONTEND_INSTALLER,
     DASHBOARD_FILES,
-    DASHBOARD_DEPENDENCIES_PATH,
     DEFAULT_CONFIGURE_ENERGY_DASHBOARD,
     DEFAULT_IMPORT_DASHBOARDS,
     DOMAIN,
+    dashboard_dependencies_path,
 )
 from .coordinator import (
+    SolarCubeAgentsCoordinator,
     SolarCubeDataCoordinator,
-    SolarCubeForecastCoordinator,
-    SolarCubeOptimalActionsCoordinator,
 )
 from .sensor_definitions import SENSOR_DEFINITIONS
 
@@ -103,19 +106,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     data_coordinator = SolarCubeDataCoordinator(
         hass, api, config, SENSOR_DEFINITIONS
     )
-    forecast_coordinator = SolarCubeForecastCoordinator(hass, api, config)
-    optimal_coordinator = SolarCubeOptimalActionsCoordinator(hass, api, config)
+    agents_coordinator = SolarCubeAgentsCoordinator(hass, api, config)
 
-    await data_coordinator.async_config_entry_first_refresh()
-    await forecast_coordinator.async_config_entry_first_refresh()
-    await optimal_coordinator.async_config_entry_first_refresh()
+    # Refresh concurrently to shorten setup. Later polls reuse the open
+    # connection through the API's keep-alive, which outlasts UPDATE_INTERVAL.
+    # Let both refreshes settle before closing the client on failure so
+    # neither keeps running against a closed session.
+    try:
+        results = await asyncio.gather(
+            data_coordinator.async_config_entry_first_refresh(),
+            agents_coordinator.async_config_entry_first_refresh(),
+            return_exceptions=True,
+        )
+    except BaseException:
+        await api.async_close()
+        raise
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        # Setup failed, so unload never runs: close the client here or each
+        # retry leaks its session. Auth failures win so reauth is started.
+        await api.async_close()
+        raise next(
+            (err for err in errors if isinstance(err, ConfigEntryAuthFailed)),
+            errors[0],
+        )
 
     domain_data = hass.data.setdefault(DOMAIN, {})
     domain_data[entry.entry_id] = {
         "api": api,
         "data_coordinator": data_coordinator,
-        "forecast_coordinator": forecast_coordinator,
-        "optimal_coordinator": optimal_coordinator,
+        "agents_coordinator": agents_coordinator,
         CONF_DATA_BUCKET: config[CONF_DATA_BUCKET],
         CONF_AGENTS_BUCKET: config[CONF_AGENTS_BUCKET],
         CONF_NAME: config.get(CONF_NAME) or entry.title,
@@ -123,6 +143,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     entry.async_on_unload(entry.add_update_listener(_async_reload_entry))
 
+    # Config entries are not unloaded at shutdown, so close the client's
+    # session and keep-alive connector when Home Assistant stops.
+    async def _async_close_api(_event: Event) -> None:
+        await api.async_close()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_api)
+    )
+
     installer_selected = bool(config.get(CONF_RUN_FRONTEND_INSTALLER))
     restart_needed = False
 
@@ -434,17 +463,19 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         api = entry_data.get("api")
         if api is not None:
-            try:
-                api.close()
-            except Exception:  # noqa: BLE001
-                pass
+            await api.async_close()
 
+        # Runtime flags live next to the per-entry data, so count entries by
+        # their ids rather than by every key in the domain data.
         active_entries = {
-            key for key in domain_data.keys() if key != "dashboards_registered"
+            other.entry_id
+            for other in hass.config_entries.async_entries(DOMAIN)
+            if other.entry_id in domain_data
         }
 
         if not active_entries:
             domain_data.pop("dependencies_installed", None)
+            domain_data.pop("orphaned_entities_cleaned", None)
             await _async_remove_dashboards(
                 hass, domain_data.pop("dashboards_registered", set())
             )
@@ -830,19 +861,18 @@ async def _load_dashboard_dependencies(
         },
     ]
 
-    if not DASHBOARD_DEPENDENCIES_PATH.exists():
+    dependencies_path = dashboard_dependencies_path()
+    if not dependencies_path.exists():
         return defaults
 
     try:
         data = await hass.async_add_executor_job(
-            lambda: json.loads(
-                DASHBOARD_DEPENDENCIES_PATH.read_text(encoding="utf-8")
-            )
+            lambda: json.loads(dependencies_path.read_text(encoding="utf-8"))
         )
     except (OSError, json.JSONDecodeError) as err:
         LOGGER.warning(
             "Failed to read dashboard dependencies from %s: %s",
-            DASHBOARD_DEPENDENCIES_PATH,
+            dependencies_path,
             err,
         )
         return defaults
@@ -2,16 +2,19 @@
 from __future__ import annotations
 
 import asyncio
+import csv
+import io
 import json
 import logging
-from datetime import datetime
-from typing import Any, Dict, List
+from datetime import datetime, tzinfo
+from typing import Any, Callable, Dict, List
 
-import influxdb_client
-from influxdb_client.rest import ApiException
+import aiohttp
 
 from homeassistant.util import dt as dt_util
 
+from .const import UPDATE_INTERVAL
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -23,6 +26,21 @@ class SolarCubeApiRequestError(Exception):
     """Raised when an InfluxDB request fails for non-auth reasons."""
 
 
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+# Keep idle connections past the next data poll so every tick (and the agents
+# refresh sharing it) reuses an open connection instead of reconnecting.
+KEEPALIVE_TIMEOUT = UPDATE_INTERVAL.total_seconds() + 15
+
+# Ask for the datatype annotation so values can be typed while parsing.
+QUERY_DIALECT = {
+    "header": True,
+    "delimiter": ",",
+    "annotations": ["datatype"],
+    "commentPrefix": "#",
+    "dateTimeFormat": "RFC3339",
+}
+
+
 FORECAST_QUERY = """from(bucket: {bucket_literal})
   |> range(start: now(), stop: 32h)
   |> filter(fn: (r) => r["_measurement"] == "cs")
@@ -33,18 +51,47 @@ OPTIMAL_ACTIONS_QUERY = """from(bucket: {bucket_literal})
   |> filter(fn: (r) => r["_measurement"] == "cs")
   |> filter(fn: (r) => r["_field"] == "cs/opt_actions/bc" or r["_field"] == "cs/opt_actions/bg" or r["_field"] == "cs/opt_actions/gb" or r["_field"] == "cs/opt_actions/gc" or r["_field"] == "cs/opt_actions/pb" or r["_field"] == "cs/opt_actions/pc" or r["_field"] == "cs/opt_actions/pg")"""
 
+# Forecast and optimal actions live in the same bucket and are refreshed
+# together, so both series are read in one request with named yields.
+# Only the columns the parsers read are returned to keep responses small.
+AGENTS_QUERY = (
+    FORECAST_QUERY
+    + """
+  |> keep(columns: ["_time", "_value", "_field"])
+  |> yield(name: "forecast")
+"""
+    + OPTIMAL_ACTIONS_QUERY
+    + """
+  |> keep(columns: ["_time", "_value", "_field"])
+  |> yield(name: "actions")"""
+)
+
 
 class SolarCubeApi:
-    """Lightweight wrapper around influxdb-client."""
+    """Lightweight client for the InfluxDB 2.x HTTP API."""
 
     def __init__(self, url: str, token: str, org: str) -> None:
-        self._client = influxdb_client.InfluxDBClient(
-            url=url,
-            token=self._normalize_token(token),
-            org=org,
-            connection_pool_maxsize=64,
-        )
-        self._query_api = self._client.query_api()
+        self._url = (url or "").strip().rstrip("/")
+        self._org = org
+        self._headers = {
+            "Authorization": f"Token {self._normalize_token(token)}",
+            "Accept": "application/csv",
+        }
+        # Created on first use so the session binds to the running event loop.
+        self._session: aiohttp.ClientSession | None = None
+        self._closed = False
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._closed:
+            raise SolarCubeApiRequestError("API client is closed")
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64, keepalive_timeout=KEEPALIVE_TIMEOUT
+                ),
+                timeout=REQUEST_TIMEOUT,
+            )
+        return self._session
 
     @staticmethod
     def _normalize_token(token: str) -> str:
@@ -68,211 +115,298 @@ class SolarCubeApi:
         Prefer validating via a lightweight query when a bucket is known,
         because some tokens might not have permission to list buckets.
         """
+        if bucket:
+            flux = (
+                f"from(bucket: {self._bucket_literal(bucket)}) "
+                "|> range(start: -1m) "
+                "|> limit(n: 1)"
+            )
+            _LOGGER.debug(
+                "Influx validate via query flux=%s (bucket_raw=%r)",
+                flux,
+                bucket,
+            )
+            await self._async_query(flux, "validate")
+            return
+
         try:
-            if bucket:
-                flux = (
-                    f"from(bucket: {self._bucket_literal(bucket)}) "
-                    "|> range(start: -1m) "
-                    "|> limit(n: 1)"
-                )
-                _LOGGER.debug(
-                    "Influx validate via query flux=%s (bucket_raw=%r)",
-                    flux,
-                    bucket,
-                )
-                await asyncio.to_thread(self._query_api.query, flux)
-            else:
-                buckets_api = self._client.buckets_api()
-                await asyncio.to_thread(buckets_api.find_buckets)
-        except ApiException as err:
-            if getattr(err, "status", None) == 401:
-                raise SolarCubeApiAuthError("Unauthorized") from err
-            if getattr(err, "status", None) == 400:
-                _LOGGER.error(
-                    "InfluxDB rejected Flux (validate). details=%s",
-                    self._api_exception_details(err),
-                )
-            raise SolarCubeApiRequestError(str(err)) from err
+            async with self._get_session().get(
+                f"{self._url}/api/v2/buckets",
+                params={"org": self._org, "limit": "1"},
+                headers=self._headers,
+            ) as resp:
+                body = await resp.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            raise SolarCubeApiRequestError(str(err) or repr(err)) from err
+        self._raise_for_status(resp, body, "validate")
 
-    def close(self) -> None:
-        self._client.close()
+    async def async_close(self) -> None:
+        """Close the HTTP session; safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+        session, self._session = self._session, None
+        if session is None or session.closed:
+            return
+        try:
+            await session.close()
+        except Exception:  # noqa: BLE001
+            _LOGGER.debug("Error closing InfluxDB session", exc_info=True)
+
+    async def _async_query(
+        self, flux: str, context: str
+    ) -> list[dict[str, Any]]:
+        """Run a Flux query and return its rows keyed by column name."""
+        try:
+            async with self._get_session().post(
+                f"{self._url}/api/v2/query",
+                params={"org": self._org},
+                json={"query": flux, "type": "flux", "dialect": QUERY_DIALECT},
+                headers=self._headers,
+            ) as resp:
+                body = await resp.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            raise SolarCubeApiRequestError(str(err) or repr(err)) from err
+        self._raise_for_status(resp, body, context, flux)
+        return _parse_annotated_csv(body)
+
+    def _raise_for_status(
+        self,
+        resp: aiohttp.ClientResponse,
+        body: str,
+        context: str,
+        flux: str | None = None,
+    ) -> None:
+        if resp.status < 400:
+            return
+        if resp.status == 401:
+            raise SolarCubeApiAuthError("Unauthorized")
+        if resp.status == 400:
+            _LOGGER.error(
+                "InfluxDB rejected Flux (%s). details=%s flux=%s",
+                context,
+                self._error_details(resp.status, resp.reason, body),
+                flux,
+            )
+        raise SolarCubeApiRequestError(f"({resp.status}) Reason: {resp.reason}")
 
     @staticmethod
-    def _api_exception_details(err: ApiException) -> str:
-        status = getattr(err, "status", None)
-        reason = getattr(err, "reason", None)
-        body = getattr(err, "body", None)
+    def _error_details(status: int, reason: str | None, body: str) -> str:
         # Keep log lines bounded.
-        if isinstance(body, (bytes, bytearray)):
-            try:
-                body = body.decode("utf-8", errors="replace")
-            except Exception:  # noqa: BLE001
-                body = str(body)
-        if isinstance(body, str) and len(body) > 800:
+        if len(body) > 800:
             body = body[:800] + "…"
         return f"status={status} reason={reason} body={body!r}"
 
-    async def async_query_last(
+    def build_last_batch_flux(
         self,
         bucket: str,
-        measurement: str,
-        field: str,
+        specs: list[tuple[str, str]],
         range_start: str = "-5m",
-    ) -> float | str | None:
+    ) -> str:
+        """Return the Flux reading the last value of each (measurement, field).
+
+        The query only depends on its arguments, so callers with a fixed set
+        of series can build it once and run it via async_query_last_flux.
+        """
         bucket_literal = self._bucket_literal(bucket)
-        measurement_literal = self._flux_str_literal(measurement)
-        field_literal = self._flux_str_literal(field)
-        flux = (
+        predicate = " or ".join(
+            f'(r["_measurement"] == {self._flux_str_literal(measurement)} '
+            f'and r["_field"] == {self._flux_str_literal(field)})'
+            for measurement, field in specs
+        )
+        return (
             f"from(bucket: {bucket_literal}) "
             f"|> range(start: {range_start}) "
-            f'|> filter(fn: (r) => r["_measurement"] == {measurement_literal}) '
-            f'|> filter(fn: (r) => r["_field"] == {field_literal}) '
-            "|> last()"
+            f"|> filter(fn: (r) => {predicate}) "
+            "|> last() "
+            '|> keep(columns: ["_measurement", "_field", "_value"])'
         )
-        try:
-            _LOGGER.debug(
-                "Influx query_last flux=%s (bucket_raw=%r)",
-                flux,
-                bucket,
+
+    async def async_query_last_flux(
+        self, flux: str
+    ) -> dict[tuple[str, str], float | str | None]:
+        """Run a query from build_last_batch_flux and key values by series."""
+        _LOGGER.debug("Influx query_last_batch flux=%s", flux)
+        records = await self._async_query(flux, "query_last_batch")
+        values: dict[tuple[str, str], float | str | None] = {}
+        for record in records:
+            # The first table wins when a series is split across several
+            # tag sets.
+            values.setdefault(
+                (record.get("_measurement"), record.get("_field")),
+                record.get("_value"),
             )
-            result = await asyncio.to_thread(self._query_api.query, flux)
-        except ApiException as err:
-            if getattr(err, "status", None) == 401:
-                raise SolarCubeApiAuthError("Unauthorized") from err
-            if getattr(err, "status", None) == 400:
-                _LOGGER.error(
-                    "InfluxDB rejected Flux (query_last). details=%s flux=%s",
-                    self._api_exception_details(err),
-                    flux,
-                )
-            raise SolarCubeApiRequestError(str(err)) from err
-        for table in result:
-            for record in table.records:
-                return record.get_value()
-        return None
+        return values
 
-    async def async_get_forecast(
+    async def async_get_agents_payload(
         self, bucket: str, hass_timezone: str
-    ) -> list[dict[str, Any]]:
-        try:
-            flux = FORECAST_QUERY.format(
-                bucket_literal=self._bucket_literal(bucket)
-            )
-            _LOGGER.debug(
-                "Influx forecast flux=%s (bucket_raw=%r)",
-                flux,
-                bucket,
-            )
-            result = await asyncio.to_thread(self._query_api.query, flux)
-        except ApiException as err:
-            if getattr(err, "status", None) == 401:
-                raise SolarCubeApiAuthError("Unauthorized") from err
-            if getattr(err, "status", None) == 400:
-                _LOGGER.error(
-                    "InfluxDB rejected Flux (forecast). details=%s flux=%s",
-                    self._api_exception_details(err),
-                    FORECAST_QUERY.format(
-                        bucket_literal=self._bucket_literal(bucket)
-                    ),
-                )
-            raise SolarCubeApiRequestError(str(err)) from err
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Return forecast and optimal actions series from one Flux query."""
+        flux = AGENTS_QUERY.format(bucket_literal=self._bucket_literal(bucket))
+        _LOGGER.debug(
+            "Influx agents flux=%s (bucket_raw=%r)",
+            flux,
+            bucket,
+        )
+        records = await self._async_query(flux, "agents")
         tz = dt_util.get_time_zone(hass_timezone)
-        forecast_data: Dict[str, Dict[str, Any]] = {}
-
-        for table in result:
-            for record in table.records:
-                record_time = record.get_time()
-                if isinstance(record_time, str):
-                    record_time = datetime.fromisoformat(record_time)
-                local_time = record_time.astimezone(tz)
-                hour_key = local_time.isoformat()
-                if hour_key not in forecast_data:
-                    forecast_data[hour_key] = {
-                        "ctr": None,
-                        "ts": None,
-                        "cf": None,
-                        "pf": None,
-                        "sf": None,
-                        "bp": None,
-                        "sp": None,
-                    }
-                value = record.get_value()
-                if isinstance(value, (float, int)):
-                    value = round(value, 3)
-                field = record.get_field()
-                if field == "cs/schedule/controller":
-                    forecast_data[hour_key]["ctr"] = value
-                elif field == "cs/schedule/target_soc":
-                    forecast_data[hour_key]["ts"] = value
-                elif field == "cs/forecasts/consumption_forecast_kwh":
-                    forecast_data[hour_key]["cf"] = value
-                elif field == "cs/forecasts/production_forecast_kwh":
-                    forecast_data[hour_key]["pf"] = value
-                elif field == "cs/forecasts/soc_forecast":
-                    forecast_data[hour_key]["sf"] = value
-                elif field == "cs/prices/buy_total_price_per_kwh":
-                    forecast_data[hour_key]["bp"] = value
-                elif field == "cs/prices/sell_price_per_kwh":
-                    forecast_data[hour_key]["sp"] = value
-
-        return [
-            {"dt": hour_key, **data}
-            for hour_key, data in sorted(forecast_data.items())
-        ]
-
-    async def async_get_optimal_actions(
-        self, bucket: str, hass_timezone: str
-    ) -> List[dict[str, Any]]:
-        try:
-            flux = OPTIMAL_ACTIONS_QUERY.format(
-                bucket_literal=self._bucket_literal(bucket)
-            )
-            _LOGGER.debug(
-                "Influx optimal_actions flux=%s (bucket_raw=%r)",
-                flux,
-                bucket,
-            )
-            result = await asyncio.to_thread(self._query_api.query, flux)
-        except ApiException as err:
-            if getattr(err, "status", None) == 401:
-                raise SolarCubeApiAuthError("Unauthorized") from err
-            if getattr(err, "status", None) == 400:
-                _LOGGER.error(
-                    "InfluxDB rejected Flux (optimal_actions). details=%s flux=%s",
-                    self._api_exception_details(err),
-                    OPTIMAL_ACTIONS_QUERY.format(
-                        bucket_literal=self._bucket_literal(bucket)
+        forecast_records = []
+        action_records = []
+        for record in records:
+            if record.get("result") == "actions":
+                action_records.append(record)
+            else:
+                forecast_records.append(record)
+
+        return {
+            "forecast": _forecast_rows(forecast_records, tz),
+            "actions": _optimal_action_rows(action_records, tz),
+        }
+
+
+def _parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def _parse_boolean(value: str) -> bool:
+    return value == "true"
+
+
+# Converters per annotated-CSV datatype; anything else is kept as a string.
+_DATATYPE_PARSERS: dict[str, Callable[[str], Any]] = {
+    "double": float,
+    "long": int,
+    "unsignedLong": int,
+    "boolean": _parse_boolean,
+    "dateTime:RFC3339": _parse_datetime,
+    "dateTime:RFC3339Nano": _parse_datetime,
+}
+
+
+def _parse_annotated_csv(body: str) -> list[dict[str, Any]]:
+    """Parse an annotated CSV query response into one dict per row.
+
+    Each table starts with a #datatype annotation row followed by a header
+    row; tables are separated by blank lines. Column converters are resolved
+    once per table so rows are decoded without per-cell type dispatch.
+    """
+    records: list[dict[str, Any]] = []
+    datatypes: list[str] = []
+    columns: list[tuple[int, str, Callable[[str], Any] | None]] | None = None
+    for row in csv.reader(io.StringIO(body)):
+        if not any(row):
+            datatypes = []
+            columns = None
+            continue
+        if row[0].startswith("#"):
+            if row[0] == "#datatype":
+                datatypes = row
+            columns = None
+            continue
+        if columns is None:
+            if "error" in row and "result" not in row:
+                columns = [(row.index("error"), "error", None)]
+                continue
+            columns = [
+                (
+                    index,
+                    name,
+                    _DATATYPE_PARSERS.get(
+                        datatypes[index] if index < len(datatypes) else ""
                     ),
                 )
-            raise SolarCubeApiRequestError(str(err)) from err
-        tz = dt_util.get_time_zone(hass_timezone)
-        actions: Dict[str, Dict[str, Any]] = {}
-
-        for table in result:
-            for record in table.records:
-                record_time = record.get_time()
-                if isinstance(record_time, str):
-                    record_time = datetime.fromisoformat(record_time)
-                local_time = record_time.astimezone(tz)
-                hour_key = local_time.isoformat()
-                if hour_key not in actions:
-                    actions[hour_key] = {
-                        "bc": None,
-                        "bg": None,
-                        "gb": None,
-                        "gc": None,
-                        "pb": None,
-                        "pc": None,
-                        "pg": None,
-                    }
-                value = record.get_value()
-                if isinstance(value, (float, int)):
-                    value = round(value, 3)
-                field = record.get_field()
-                short_key = field.split("/")[-1]
-                actions[hour_key][short_key] = value
-
-        return [
-            {"dt": hour_key, **data}
-            for hour_key, data in sorted(actions.items())
-        ]
+                for index, name in enumerate(row)
+                if name
+            ]
+            continue
+        if columns[0][1] == "error":
+            raise SolarCubeApiRequestError(row[columns[0][0]])
+        record: dict[str, Any] = {}
+        for index, name, parse in columns:
+            value = row[index] if index < len(row) else ""
+            if parse is None:
+                record[name] = value
+            else:
+                record[name] = parse(value) if value else None
+        records.append(record)
+    return records
+
+
+def _forecast_rows(
+    records: list[dict[str, Any]], tz: tzinfo
+) -> list[dict[str, Any]]:
+    forecast_data: Dict[str, Dict[str, Any]] = {}
+
+    for record in records:
+        record_time = record.get("_time")
+        if isinstance(record_time, str):
+            record_time = datetime.fromisoformat(record_time)
+        local_time = record_time.astimezone(tz)
+        hour_key = local_time.isoformat()
+        if hour_key not in forecast_data:
+            forecast_data[hour_key] = {
+                "ctr": None,
+                "ts": None,
+                "cf": None,
+                "pf": None,
+                "sf": None,
+                "bp": None,
+                "sp": None,
+            }
+        value = record.get("_value")
+        if isinstance(value, (float, int)):
+            value = round(value, 3)
+        field = record.get("_field") or ""
+        if field == "cs/schedule/controller":
+            forecast_data[hour_key]["ctr"] = value
+        elif field == "cs/schedule/target_soc":
+            forecast_data[hour_key]["ts"] = value
+        elif field == "cs/forecasts/consumption_forecast_kwh":
+            forecast_data[hour_key]["cf"] = value
+        elif field == "cs/forecasts/production_forecast_kwh":
+            forecast_data[hour_key]["pf"] = value
+        elif field == "cs/forecasts/soc_forecast":
+            forecast_data[hour_key]["sf"] = value
+        elif field == "cs/prices/buy_total_price_per_kwh":
+            forecast_data[hour_key]["bp"] = value
+        elif field == "cs/prices/sell_price_per_kwh":
+            forecast_data[hour_key]["sp"] = value
+
+    return [
+        {"dt": hour_key, **data}
+        for hour_key, data in sorted(forecast_data.items())
+    ]
+
+
+def _optimal_action_rows(
+    records: list[dict[str, Any]], tz: tzinfo
+) -> List[dict[str, Any]]:
+    actions: Dict[str, Dict[str, Any]] = {}
+
+    for record in records:
+        record_time = record.get("_time")
+        if isinstance(record_time, str):
+            record_time = datetime.fromisoformat(record_time)
+        local_time = record_time.astimezone(tz)
+        hour_key = local_time.isoformat()
+        if hour_key not in actions:
+            actions[hour_key] = {
+                "bc": None,
+                "bg": None,
+                "gb": None,
+                "gc": None,
+                "pb": None,
+                "pc": None,
+                "pg": None,
+            }
+        value = record.get("_value")
+        if isinstance(value, (float, int)):
+            value = round(value, 3)
+        field = record.get("_field") or ""
+        short_key = field.split("/")[-1]
+        actions[hour_key][short_key] = value
+
+    return [
+        {"dt": hour_key, **data}
+        for hour_key, data in sorted(actions.items())
+    ]
@@ -1,6 +1,10 @@
 """Config flow for Solar Cube HEMS."""
 from __future__ import annotations
 
+import hashlib
+import re
+import time
+from collections import ChainMap
 from pathlib import Path
 from typing import Any
 
@@ -31,28 +35,175 @@ from .const import (
     DOMAIN,
 )
 
+# All defaults are constants, so the static form schemas are built once.
+_USER_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_NAME, default=DEFAULT_NAME): str,
+        vol.Required(CONF_URL, default=DEFAULT_URL): str,
+        vol.Optional(CONF_TOKEN, default=""): str,
+        vol.Required(CONF_ORG, default=DEFAULT_ORG): str,
+        vol.Optional(
+            CONF_DATA_BUCKET, default=DEFAULT_DATA_BUCKET
+        ): str,
+        vol.Optional(
+            CONF_AGENTS_BUCKET, default=DEFAULT_AGENTS_BUCKET
+        ): str,
+        vol.Optional(
+            CONF_IMPORT_DASHBOARDS, default=DEFAULT_IMPORT_DASHBOARDS
+        ): bool,
+        vol.Optional(
+            CONF_RUN_FRONTEND_INSTALLER,
+            default=True,
+        ): bool,
+        vol.Optional(
+            CONF_CONFIGURE_ENERGY_DASHBOARD,
+            default=DEFAULT_CONFIGURE_ENERGY_DASHBOARD,
+        ): bool,
+    }
+)
+
+_REAUTH_SCHEMA = vol.Schema({vol.Required(CONF_TOKEN): str})
+
+# Successful validations, keyed by a hash of the connection settings, so an
+# identical resubmit within the TTL does not hit InfluxDB again.
+_VALIDATE_CACHE_TTL = 60.0
+_VALIDATE_CACHE: dict[str, float] = {}
+
+
+# Plain scalars the YAML loader resolves to null or bool rather than a string;
+# compared lowercased, and a false match only falls back to the full loader.
+_YAML_NON_STR_SCALARS = frozenset(
+    ("~", "null", "true", "false", "yes", "no", "on", "off")
+)
+# A YAML comment starts at "#" preceded by any whitespace.
+_YAML_COMMENT_RE = re.compile(r"\s#")
+
+
+def _validate_cache_key(
+    url: str, org: str, bucket: str | None, token: str
+) -> str:
+    return hashlib.sha256(f"{url}|{org}|{bucket}|{token}".encode()).hexdigest()
+
+
+class _SolarCubeValidateMixin:
+    """Validate InfluxDB settings, keeping one API client per flow."""
+
+    _api: SolarCubeApi | None = None
+    _api_settings: tuple[str, str, str] | None = None
+
+    async def _async_validate(
+        self, url: str, token: str, org: str, bucket: str | None
+    ) -> None:
+        cache_key = _validate_cache_key(url, org, bucket, token)
+        now = time.monotonic()
+        validated_at = _VALIDATE_CACHE.get(cache_key)
+        if validated_at is not None and now - validated_at < _VALIDATE_CACHE_TTL:
+            return
+
+        settings = (url, token, org)
+        if self._api is None or self._api_settings != settings:
+            if self._api is not None:
+                await self._api.async_close()
+            self._api = SolarCubeApi(url=url, token=token, org=org)
+            self._api_settings = settings
+        await self._api.async_validate(bucket=bucket)
+
+        for key, stamp in list(_VALIDATE_CACHE.items()):
+            if now - stamp >= _VALIDATE_CACHE_TTL:
+                del _VALIDATE_CACHE[key]
+        _VALIDATE_CACHE[cache_key] = time.monotonic()
+
+    @callback
+    def async_remove(self) -> None:
+        """Close the API client once the flow is finished or aborted."""
+        if self._api is not None:
+            self.hass.async_create_task(self._api.async_close())  # type: ignore[attr-defined]
+            self._api = None
+            self._api_settings = None
+        super().async_remove()  # type: ignore[misc]
+
 
 @config_entries.HANDLERS.register(DOMAIN)
-class SolarCubeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
+class SolarCubeConfigFlow(
+    _SolarCubeValidateMixin, config_entries.ConfigFlow, domain=DOMAIN
+):
     """Handle a config flow for Solar Cube."""
 
     VERSION = 1
 
     _reauth_entry: ConfigEntry | None = None
+    _cached_token: tuple[tuple[float, float | None], str] | None = None
 
     async def _async_token_from_configuration_yaml(self) -> str:
-        """Load influxdb_token from configuration.yaml (best-effort)."""
-
-        config_path = Path(self.hass.config.config_dir) / "configuration.yaml"
-        if not config_path.exists():
+        """Load influxdb_token from configuration.yaml (best-effort).
+
+        A found token is cached with the mtimes of configuration.yaml and
+        secrets.yaml (a !secret token lives in the latter) so resubmitting the
+        form does not re-parse unchanged files. Empty results are not cached.
+        """
+
+        config_dir = Path(self.hass.config.config_dir)
+        config_path = config_dir / "configuration.yaml"
+        try:
+            config_mtime = config_path.stat().st_mtime
+        except OSError:
+            return ""
+        try:
+            secrets_mtime: float | None = (
+                (config_dir / "secrets.yaml").stat().st_mtime
+            )
+        except OSError:
+            secrets_mtime = None
+        mtimes = (config_mtime, secrets_mtime)
+
+        if self._cached_token is not None and self._cached_token[0] == mtimes:
+            return self._cached_token[1]
+
+        secrets = Secrets(config_dir)
+
+        def _scan() -> str | None:
+            """Find a top-level influxdb_token line without parsing the YAML.
+
+            Returns None when the value needs the full YAML loader.
+            """
+            with open(config_path, encoding="utf-8") as config_file:
+                for line in config_file:
+                    key, sep, value = line.partition(":")
+                    if key != "influxdb_token" or not sep:
+                        continue
+                    if value[:1] not in ("", " ", "\t", "\r", "\n"):
+                        return None
+                    value = value.strip()
+                    if value.startswith("!secret "):
+                        secret = secrets.get(
+                            str(config_path), value[len("!secret ") :].strip()
+                        )
+                        return secret.strip() if isinstance(secret, str) else ""
+                    if len(value) >= 2 and value[0] == value[-1] == "'":
+                        return value[1:-1].replace("''", "'").strip()
+                    if len(value) >= 2 and value[0] == value[-1] == '"':
+                        return None if "\\" in value else value[1:-1].strip()
+                    value = _YAML_COMMENT_RE.split(value, 1)[0].strip()
+                    if not value or value[0] in "|>!&*[{'\"":
+                        return None
+                    if value.lower() in _YAML_NON_STR_SCALARS:
+                        return None
+                    return value
             return ""
 
         def _read() -> str:
             try:
-                data = load_yaml_dict(
-                    str(config_path),
-                    Secrets(Path(self.hass.config.config_dir)),
-                )
+                token = _scan()
+            except FileNotFoundError:
+                # Removed since the stat() probe; nothing left to fall back to.
+                return ""
+            except Exception:  # noqa: BLE001
+                token = None
+            if token is not None:
+                return token
+
+            try:
+                data = load_yaml_dict(str(config_path), secrets)
             except Exception:  # noqa: BLE001
                 return ""
 
@@ -62,7 +213,10 @@ class SolarCubeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             token = data.get("influxdb_token")
             return token.strip() if isinstance(token, str) else ""
 
-        return await self.hass.async_add_executor_job(_read)
+        token = await self.hass.async_add_executor_job(_read)
+        if token:
+            self._cached_token = (mtimes, token)
+        return token
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -78,14 +232,12 @@ class SolarCubeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "missing_token"
             else:
                 try:
-                    api = SolarCubeApi(
+                    await self._async_validate(
                         url=user_input[CONF_URL],
                         token=token,
                         org=user_input[CONF_ORG],
-                    )
-                    await api.async_validate(
                         bucket=user_input.get(CONF_DATA_BUCKET)
-                        or DEFAULT_DATA_BUCKET
+                        or DEFAULT_DATA_BUCKET,
                     )
                 except SolarCubeApiAuthError:
                     errors["base"] = "invalid_auth"
@@ -93,11 +245,6 @@ class SolarCubeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     errors["base"] = "cannot_connect"
                 except Exception:  # noqa: BLE001
                     errors["base"] = "unknown"
-                finally:
-                    try:
-                        api.close()
-                    except Exception:  # noqa: BLE001
-                        pass
 
             if not errors:
                 await self.async_set_unique_id(DOMAIN)
@@ -109,34 +256,8 @@ class SolarCubeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     data=entry_data,
                 )
 
-        schema = vol.Schema(
-            {
-                vol.Optional(CONF_NAME, default=DEFAULT_NAME): str,
-                vol.Required(CONF_URL, default=DEFAULT_URL): str,
-                vol.Optional(CONF_TOKEN, default=""): str,
-                vol.Required(CONF_ORG, default=DEFAULT_ORG): str,
-                vol.Optional(
-                    CONF_DATA_BUCKET, default=DEFAULT_DATA_BUCKET
-                ): str,
-                vol.Optional(
-                    CONF_AGENTS_BUCKET, default=DEFAULT_AGENTS_BUCKET
-                ): str,
-                vol.Optional(
-                    CONF_IMPORT_DASHBOARDS, default=DEFAULT_IMPORT_DASHBOARDS
-                ): bool,
-                vol.Optional(
-                    CONF_RUN_FRONTEND_INSTALLER,
-                    default=True,
-                ): bool,
-                vol.Optional(
-                    CONF_CONFIGURE_ENERGY_DASHBOARD,
-                    default=DEFAULT_CONFIGURE_ENERGY_DASHBOARD,
-                ): bool,
-            }
-        )
-
         return self.async_show_form(
-            step_id="user", data_schema=schema, errors=errors
+            step_id="user", data_schema=_USER_SCHEMA, errors=errors
         )
 
     async def async_step_reauth(
@@ -161,30 +282,31 @@ class SolarCubeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return self.async_abort(reason="unknown")
 
         if user_input is not None:
+            current = ChainMap(entry.options, entry.data)
             try:
-                api = SolarCubeApi(
-                    url=entry.options.get(CONF_URL, entry.data[CONF_URL]),
+                await self._async_validate(
+                    url=current[CONF_URL],
                     token=user_input[CONF_TOKEN],
-                    org=entry.options.get(CONF_ORG, entry.data[CONF_ORG]),
-                )
-                data_bucket = entry.options.get(
-                    CONF_DATA_BUCKET,
-                    entry.data.get(CONF_DATA_BUCKET, DEFAULT_DATA_BUCKET),
+                    org=current[CONF_ORG],
+                    bucket=current.get(CONF_DATA_BUCKET, DEFAULT_DATA_BUCKET),
                 )
-                await api.async_validate(bucket=data_bucket)
             except SolarCubeApiAuthError:
                 errors["base"] = "invalid_auth"
             except SolarCubeApiRequestError:
                 errors["base"] = "cannot_connect"
             except Exception:  # noqa: BLE001
                 errors["base"] = "unknown"
-            finally:
-                try:
-                    api.close()
-                except Exception:  # noqa: BLE001
-                    pass
 
             if not errors:
+                # Stop polling with the rejected token; the reload below
+                # creates fresh coordinators with the new one.
+                entry_data = self.hass.data.get(DOMAIN, {}).get(entry.entry_id)
+                if isinstance(entry_data, dict):
+                    for key in ("data_coordinator", "agents_coordinator"):
+                        coordinator = entry_data.get(key)
+                        if coordinator is not None:
+                            await coordinator.async_shutdown()
+
                 # Store token in options because entry.options override entry.data in async_setup_entry.
                 new_options = {
                     **entry.options,
@@ -197,9 +319,8 @@ class SolarCubeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 await self.hass.config_entries.async_reload(entry.entry_id)
                 return self.async_abort(reason="reauth_successful")
 
-        schema = vol.Schema({vol.Required(CONF_TOKEN): str})
         return self.async_show_form(
-            step_id="reauth_confirm", data_schema=schema, errors=errors
+            step_id="reauth_confirm", data_schema=_REAUTH_SCHEMA, errors=errors
         )
 
     @staticmethod
@@ -210,18 +331,63 @@ class SolarCubeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return SolarCubeOptionsFlowHandler(config_entry)
 
 
-class SolarCubeOptionsFlowHandler(config_entries.OptionsFlow):
+class SolarCubeOptionsFlowHandler(
+    _SolarCubeValidateMixin, config_entries.OptionsFlow
+):
     """Handle options for Solar Cube."""
 
     def __init__(self, config_entry: ConfigEntry) -> None:
         self._entry = config_entry
+        # The entry does not change while the flow is open, so the merged
+        # settings and the form schema are built once and reused on redraws.
+        self._current = current = ChainMap(
+            config_entry.options, config_entry.data
+        )
+        self._schema = vol.Schema(
+            {
+                vol.Optional(CONF_NAME, default=config_entry.title): str,
+                vol.Required(
+                    CONF_URL, default=current.get(CONF_URL, DEFAULT_URL)
+                ): str,
+                vol.Optional(CONF_TOKEN, default=""): str,
+                vol.Required(
+                    CONF_ORG, default=current.get(CONF_ORG, DEFAULT_ORG)
+                ): str,
+                vol.Required(
+                    CONF_DATA_BUCKET,
+                    default=current.get(CONF_DATA_BUCKET, DEFAULT_DATA_BUCKET),
+                ): str,
+                vol.Required(
+                    CONF_AGENTS_BUCKET,
+                    default=current.get(
+                        CONF_AGENTS_BUCKET, DEFAULT_AGENTS_BUCKET
+                    ),
+                ): str,
+                vol.Required(
+                    CONF_IMPORT_DASHBOARDS,
+                    default=current.get(
+                        CONF_IMPORT_DASHBOARDS, DEFAULT_IMPORT_DASHBOARDS
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_RUN_FRONTEND_INSTALLER,
+                    default=current.get(CONF_RUN_FRONTEND_INSTALLER, True),
+                ): bool,
+                vol.Required(
+                    CONF_CONFIGURE_ENERGY_DASHBOARD,
+                    default=current.get(
+                        CONF_CONFIGURE_ENERGY_DASHBOARD,
+                        DEFAULT_CONFIGURE_ENERGY_DASHBOARD,
+                    ),
+                ): bool,
+            }
+        )
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         errors: dict[str, str] = {}
-
-        current = {**self._entry.data, **self._entry.options}
+        current = self._current
 
         if user_input is not None:
             # Treat empty token as "keep existing" to avoid leaking it via defaults.
@@ -229,23 +395,18 @@ class SolarCubeOptionsFlowHandler(config_entries.OptionsFlow):
             candidate_token = token or current.get(CONF_TOKEN, "")
 
             try:
-                api = SolarCubeApi(
+                await self._async_validate(
                     url=user_input[CONF_URL],
                     token=candidate_token,
                     org=user_input[CONF_ORG],
+                    bucket=user_input[CONF_DATA_BUCKET],
                 )
-                await api.async_validate(bucket=user_input[CONF_DATA_BUCKET])
             except SolarCubeApiAuthError:
                 errors["base"] = "invalid_auth"
             except SolarCubeApiRequestError:
                 errors["base"] = "cannot_connect"
             except Exception:  # noqa: BLE001
                 errors["base"] = "unknown"
-            finally:
-                try:
-                    api.close()
-                except Exception:  # noqa: BLE001
-                    pass
 
             if not errors:
                 # Persist most fields as options (override entry.data).
@@ -280,46 +441,6 @@ class SolarCubeOptionsFlowHandler(config_entries.OptionsFlow):
 
                 return self.async_create_entry(title="", data=new_options)
 
-        schema = vol.Schema(
-            {
-                vol.Optional(CONF_NAME, default=self._entry.title): str,
-                vol.Required(
-                    CONF_URL, default=current.get(CONF_URL, DEFAULT_URL)
-                ): str,
-                vol.Optional(CONF_TOKEN, default=""): str,
-                vol.Required(
-                    CONF_ORG, default=current.get(CONF_ORG, DEFAULT_ORG)
-                ): str,
-                vol.Required(
-                    CONF_DATA_BUCKET,
-                    default=current.get(CONF_DATA_BUCKET, DEFAULT_DATA_BUCKET),
-                ): str,
-                vol.Required(
-                    CONF_AGENTS_BUCKET,
-                    default=current.get(
-                        CONF_AGENTS_BUCKET, DEFAULT_AGENTS_BUCKET
-                    ),
-                ): str,
-                vol.Required(
-                    CONF_IMPORT_DASHBOARDS,
-                    default=current.get(
-                        CONF_IMPORT_DASHBOARDS, DEFAULT_IMPORT_DASHBOARDS
-                    ),
-                ): bool,
-                vol.Optional(
-                    CONF_RUN_FRONTEND_INSTALLER,
-                    default=current.get(CONF_RUN_FRONTEND_INSTALLER, True),
-                ): bool,
-                vol.Required(
-                    CONF_CONFIGURE_ENERGY_DASHBOARD,
-                    default=current.get(
-                        CONF_CONFIGURE_ENERGY_DASHBOARD,
-                        DEFAULT_CONFIGURE_ENERGY_DASHBOARD,
-                    ),
-                ): bool,
-            }
-        )
-
         return self.async_show_form(
-            step_id="init", data_schema=schema, errors=errors
+            step_id="init", data_schema=self._schema, errors=errors
         )
@@ -1,5 +1,7 @@
 from datetime import timedelta
+from functools import cache
 from pathlib import Path
+from types import MappingProxyType
 
 DOMAIN = "solar_cube"
 DEFAULT_NAME = "Solar Cube"
@@ -16,18 +18,21 @@ CONF_IMPORT_DASHBOARDS = "import_dashboards"
 CONF_RUN_FRONTEND_INSTALLER = "run_frontend_installer"
 CONF_CONFIGURE_ENERGY_DASHBOARD = "configure_energy_dashboard"
 
-DASHBOARD_FILES = {
-    "solar-cube-panel": "panel_solar_cube_pl.yaml",
-    "solar-cube-history": "history_solar_cube_pl.yaml",
-    "solar-cube-forecasts": "forecasts_solar_cube_pl.yaml",
-}
+DASHBOARD_FILES = MappingProxyType(
+    {
+        "solar-cube-panel": "panel_solar_cube_pl.yaml",
+        "solar-cube-history": "history_solar_cube_pl.yaml",
+        "solar-cube-forecasts": "forecasts_solar_cube_pl.yaml",
+    }
+)
+
 
 # Dashboards and dependencies are bundled with the integration so they are available
 # even when installed via HACS (which typically installs only custom_components/*).
-DASHBOARD_DEPENDENCIES_PATH = (
-    Path(__file__).parent / "dashboards" / "dependencies.json"
-)
+@cache
+def dashboard_dependencies_path() -> Path:
+    return Path(__file__).parent / "dashboards" / "dependencies.json"
+
 
 UPDATE_INTERVAL = timedelta(seconds=30)
-FORECAST_UPDATE_INTERVAL = timedelta(minutes=30)
-OPTIMAL_ACTIONS_UPDATE_INTERVAL = timedelta(minutes=30)
+AGENTS_UPDATE_INTERVAL = timedelta(minutes=30)
@@ -3,6 +3,9 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from datetime import datetime, timezone
+from functools import partial
 from typing import Any
 
 from homeassistant.core import HomeAssistant
@@ -11,15 +14,13 @@ from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
-from homeassistant.util import dt as dt_util
 
 from .api import SolarCubeApi, SolarCubeApiAuthError, SolarCubeApiRequestError
 from .const import (
+    AGENTS_UPDATE_INTERVAL,
     CONF_AGENTS_BUCKET,
     CONF_DATA_BUCKET,
     DOMAIN,
-    FORECAST_UPDATE_INTERVAL,
-    OPTIMAL_ACTIONS_UPDATE_INTERVAL,
     UPDATE_INTERVAL,
 )
 
@@ -39,6 +40,31 @@ class SolarCubeDataCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.api = api
         self.entry_data = entry_data
         self.sensor_definitions = sensor_definitions
+        # Group definitions by (bucket, range_start) so each group is read with
+        # one Flux query; map (measurement, field) back to the sensor keys.
+        data_bucket = entry_data.get(CONF_DATA_BUCKET)
+        groups: dict[tuple[str, str], dict[tuple[str, str], list[str]]] = {}
+        for definition in sensor_definitions:
+            group = groups.setdefault(
+                (
+                    definition.get("bucket", data_bucket),
+                    definition.get("range_start", "-5m"),
+                ),
+                {},
+            )
+            group.setdefault(
+                (definition["measurement"], definition["field"]), []
+            ).append(definition["key"])
+        # The queries never change, so their Flux text is built once here.
+        self._queries: list[tuple[str, dict[tuple[str, str], list[str]]]] = [
+            (
+                api.build_last_batch_flux(bucket, list(series_keys), range_start),
+                series_keys,
+            )
+            for (bucket, range_start), series_keys in groups.items()
+        ]
+        self._query_last_flux = api.async_query_last_flux
+        self._last_update_iso: tuple[float, str] | None = None
         super().__init__(
             hass,
             _LOGGER,
@@ -47,70 +73,58 @@ class SolarCubeDataCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         )
 
     async def _async_update_data(self) -> dict[str, Any]:
-        try:
-            data_bucket = self.entry_data.get(CONF_DATA_BUCKET)
-
-            async def _fetch_value(
-                definition: dict[str, Any]
-            ) -> tuple[str, Any]:
-                bucket = definition.get("bucket", data_bucket)
-                value = await self.api.async_query_last(
-                    bucket=bucket,
-                    measurement=definition["measurement"],
-                    field=definition["field"],
-                    range_start=definition.get("range_start", "-5m"),
-                )
-                return definition["key"], value
-
-            results = await asyncio.gather(
-                *(_fetch_value(d) for d in self.sensor_definitions)
-            )
-            values = dict(results)
-
-            values["_last_update"] = dt_util.utcnow().isoformat()
-            return values
-        except SolarCubeApiAuthError as err:
-            raise ConfigEntryAuthFailed("InfluxDB unauthorized") from err
-        except SolarCubeApiRequestError as err:
-            raise UpdateFailed(str(err)) from err
-
-
-class SolarCubeForecastCoordinator(
-    DataUpdateCoordinator[list[dict[str, Any]]]
-):
-    """Coordinator for forecast data."""
-
-    def __init__(
-        self,
-        hass: HomeAssistant,
-        api: SolarCubeApi,
-        entry_data: dict[str, Any],
-    ) -> None:
-        self.api = api
-        self.entry_data = entry_data
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=f"{DOMAIN}_forecast",
-            update_interval=FORECAST_UPDATE_INTERVAL,
+        # Let every query settle before translating errors so a single failure
+        # does not leave sibling requests running in the background.
+        query = self._query_last_flux
+        results = await asyncio.gather(
+            *(query(flux) for flux, _ in self._queries),
+            return_exceptions=True,
         )
 
-    async def _async_update_data(self) -> list[dict[str, Any]]:
-        try:
-            return await self.api.async_get_forecast(
-                bucket=self.entry_data[CONF_AGENTS_BUCKET],
-                hass_timezone=self.hass.config.time_zone,
+        values: dict[str, Any] = {}
+        request_error: SolarCubeApiRequestError | None = None
+        for (_, series_keys), result in zip(self._queries, results):
+            if isinstance(result, SolarCubeApiAuthError):
+                raise ConfigEntryAuthFailed("InfluxDB unauthorized") from result
+            if isinstance(result, SolarCubeApiRequestError):
+                request_error = request_error or result
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            for series, keys in series_keys.items():
+                value = result.get(series)
+                for key in keys:
+                    values[key] = value
+
+        if request_error is not None:
+            raise UpdateFailed(str(request_error)) from request_error
+
+        values["_last_update_ts"] = time.time()
+        return values
+
+    @property
+    def last_update_iso(self) -> str | None:
+        """Return the last poll time as an ISO string, formatted on demand."""
+        timestamp = (self.data or {}).get("_last_update_ts")
+        if timestamp is None:
+            return None
+        cached = self._last_update_iso
+        if cached is None or cached[0] != timestamp:
+            cached = self._last_update_iso = (
+                timestamp,
+                datetime.fromtimestamp(timestamp, timezone.utc).isoformat(),
             )
-        except SolarCubeApiAuthError as err:
-            raise ConfigEntryAuthFailed("InfluxDB unauthorized") from err
-        except SolarCubeApiRequestError as err:
-            raise UpdateFailed(str(err)) from err
+        return cached[1]
 
 
-class SolarCubeOptimalActionsCoordinator(
-    DataUpdateCoordinator[list[dict[str, Any]]]
+class SolarCubeAgentsCoordinator(
+    DataUpdateCoordinator[dict[str, list[dict[str, Any]]]]
 ):
-    """Coordinator for optimal actions data."""
+    """Coordinator for forecast and optimal actions data.
+
+    Both series come from the agents bucket on the same schedule, so they are
+    fetched together and exposed as ``{"forecast": [...], "actions": [...]}``.
+    """
 
     def __init__(
         self,
@@ -120,20 +134,45 @@ class SolarCubeOptimalActionsCoordinator(
     ) -> None:
         self.api = api
         self.entry_data = entry_data
+        # The bucket is fixed for the lifetime of the entry (a reload rebuilds
+        # the coordinator), so bind it once. The time zone is read per fetch
+        # because changing it does not reload integrations.
+        self._fetch = partial(
+            api.async_get_agents_payload, bucket=entry_data[CONF_AGENTS_BUCKET]
+        )
+        # Point sensors share rows through point(); the cache is keyed on the
+        # identity of the payload so a new tick invalidates it implicitly.
+        self._points: dict[tuple[str, int], dict[str, Any] | None] = {}
+        self._points_source: dict[str, list[dict[str, Any]]] | None = None
         super().__init__(
             hass,
             _LOGGER,
-            name=f"{DOMAIN}_optimal_actions",
-            update_interval=OPTIMAL_ACTIONS_UPDATE_INTERVAL,
+            name=f"{DOMAIN}_agents",
+            update_interval=AGENTS_UPDATE_INTERVAL,
         )
 
-    async def _async_update_data(self) -> list[dict[str, Any]]:
+    async def _async_update_data(self) -> dict[str, list[dict[str, Any]]]:
         try:
-            return await self.api.async_get_optimal_actions(
-                bucket=self.entry_data[CONF_AGENTS_BUCKET],
-                hass_timezone=self.hass.config.time_zone,
-            )
+            return await self._fetch(hass_timezone=self.hass.config.time_zone)
         except SolarCubeApiAuthError as err:
             raise ConfigEntryAuthFailed("InfluxDB unauthorized") from err
         except SolarCubeApiRequestError as err:
             raise UpdateFailed(str(err)) from err
+
+    def point(self, series: str, index: int) -> dict[str, Any] | None:
+        """Return row ``index`` of ``series`` if present, memoized per tick."""
+        data = self.data
+        if data is not self._points_source:
+            self._points = {}
+            self._points_source = data
+        key = (series, index)
+        try:
+            return self._points[key]
+        except KeyError:
+            pass
+        rows = data.get(series) if data else None
+        item = rows[index] if rows and len(rows) > index else None
+        if not isinstance(item, dict):
+            item = None
+        self._points[key] = item
+        return item
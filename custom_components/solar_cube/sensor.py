@@ -1,8 +1,12 @@
 """Sensor platform for Solar Cube."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+import abc
+import time
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
+from itertools import chain
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -11,8 +15,9 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.start import async_at_started
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.typing import DiscoveryInfoType
@@ -20,19 +25,20 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
-from .coordinator import (
-    SolarCubeDataCoordinator,
-    SolarCubeForecastCoordinator,
-    SolarCubeOptimalActionsCoordinator,
-)
+from .coordinator import SolarCubeAgentsCoordinator, SolarCubeDataCoordinator
+from .sensor_definitions import SENSOR_DEFINITIONS
+
+
+_UNSET: Any = object()
 
 
 def _round_float(value: Any) -> Any:
     """Round floats to at most 5 decimal places to avoid float artifacts."""
 
-    if isinstance(value, float):
-        # Use string formatting to avoid representations like 0.000555800000000186.
-        return float(f"{value:.5f}")
+    # round() returns the nearest double, which reprs without artifacts like
+    # 0.000555800000000186; the exact class check skips the isinstance walk.
+    if value.__class__ is float:
+        return round(value, 5)
     return value
 
 
@@ -59,16 +65,68 @@ async def _async_cleanup_orphaned_entities(hass: HomeAssistant) -> None:
         e.entry_id for e in hass.config_entries.async_entries(DOMAIN)
     }
 
-    # Iterate all registry entries and remove those created by our platform
-    # that belong to config entries that no longer exist.
-    for entity_entry in list(ent_reg.entities.values()):
-        if entity_entry.platform != DOMAIN:
-            continue
-        if (
-            entity_entry.config_entry_id
-            and entity_entry.config_entry_id not in active_entry_ids
-        ):
-            ent_reg.async_remove(entity_entry.entity_id)
+    # The registry has no index by platform, so find our stale entries in one
+    # pass without copying it, then remove them once iteration is done.
+    stale_entity_ids = [
+        entity_entry.entity_id
+        for entity_entry in ent_reg.entities.values()
+        if entity_entry.platform == DOMAIN
+        and entity_entry.config_entry_id
+        and entity_entry.config_entry_id not in active_entry_ids
+    ]
+    for entity_id in stale_entity_ids:
+        ent_reg.async_remove(entity_id)
+
+
+def _hour_start(now: datetime) -> datetime:
+    return now.replace(minute=0, second=0, microsecond=0)
+
+
+def _day_start(now: datetime) -> datetime:
+    return now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _week_start(now: datetime) -> datetime:
+    # Week starts Sunday 00:00 local (matches the provided cron: 0 0 * * 7).
+    days_since_sunday = (now.weekday() + 1) % 7
+    d = (now - timedelta(days=days_since_sunday)).date()
+    return datetime(d.year, d.month, d.day, tzinfo=now.tzinfo)
+
+
+def _month_start(now: datetime) -> datetime:
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _no_start(now: datetime) -> datetime:
+    return now
+
+
+_PERIOD_START_FNS: dict[str, Callable[[datetime], datetime]] = {
+    "hourly": _hour_start,
+    "daily": _day_start,
+    "weekly": _week_start,
+    "monthly": _month_start,
+}
+
+# Period keys for the current second, shared by all period meters so a
+# coordinator update computes each key once instead of once per sensor.
+_PERIOD_KEY_CACHE: dict[tuple[str, int], str] = {}
+
+
+def _period_key(period: str) -> str:
+    """Return the ISO start of the current local period."""
+
+    cache_key = (period, int(time.monotonic()))
+    if (key := _PERIOD_KEY_CACHE.get(cache_key)) is not None:
+        return key
+    if _PERIOD_KEY_CACHE and next(iter(_PERIOD_KEY_CACHE))[1] != cache_key[1]:
+        _PERIOD_KEY_CACHE.clear()
+
+    start = _PERIOD_START_FNS.get(period, _no_start)(
+        dt_util.as_local(dt_util.now())
+    )
+    key = _PERIOD_KEY_CACHE[cache_key] = start.isoformat()
+    return key
 
 
 @dataclass
@@ -76,13 +134,135 @@ class SolarCubeSensorEntityDescription(SensorEntityDescription):
     key: str
 
 
+# (horizon, row index) pairs read by the forecast and optimal point sensors.
+_HORIZONS = (("1h", 3), ("6h", 23))
+_FORECAST_VALUES = (
+    ("pf", "forecasted_production", "Forecasted Production"),
+    ("cf", "forecasted_consumption", "Forecasted Consumption"),
+    ("sf", "soc_forecast", "SoC Forecast"),
+)
+_OPTIMAL_KEYS = ("gb", "bg", "bc", "gc", "pb", "pc", "pg")
+
+# Static sensor tables with keys and names fully formatted at import, so
+# setup only has to pass them through.
+_FORECAST_POINTS: tuple[tuple[str, str, int, str], ...] = tuple(
+    (
+        f"{key}_{horizon}",
+        f"SolarCube {label} {horizon.upper()}",
+        index,
+        value_key,
+    )
+    for horizon, index in _HORIZONS
+    for value_key, key, label in _FORECAST_VALUES
+)
+_OPTIMAL_POINTS: tuple[tuple[str, str, int, str], ...] = tuple(
+    (
+        f"optimal_{value_key}_{horizon}",
+        f"SolarCube Optimal {value_key.upper()} {horizon.upper()}",
+        index,
+        value_key,
+    )
+    for horizon, index in _HORIZONS
+    for value_key in _OPTIMAL_KEYS
+)
+
+_KWH_TOTALS: tuple[tuple[str, str, str], ...] = (
+    ("ess_discharged_energy", "ESS Discharged Energy", "ess_discharge_energy"),
+    ("ess_charged_energy", "ESS Charged Energy", "ess_charge_energy"),
+    (
+        "grid_buy_active_energy_total",
+        "Grid Buy Active Energy Total",
+        "grid_buy_active_energy",
+    ),
+    (
+        "grid_sell_active_energy_total",
+        "Grid Sell Active Energy Total",
+        "grid_sell_active_energy",
+    ),
+    ("pv_active_energy_total", "PV Active Energy Total", "pv_active_energy"),
+    (
+        "consumption_active_energy_total",
+        "Consumption Active Energy Total",
+        "consumption_active_energy",
+    ),
+)
+
+# (key, name, source key, source unit) metered for every short period.
+_PERIOD_SOURCES: tuple[tuple[str, str, str, str], ...] = (
+    ("grid_sell_energy", "Grid Sell Energy", "grid_sell_active_energy", "Wh"),
+    ("grid_buy_energy", "Grid Buy Energy", "grid_buy_active_energy", "Wh"),
+    ("pv_energy", "PV Energy", "pv_active_energy", "Wh"),
+    (
+        "consumption_energy",
+        "Consumption Energy",
+        "consumption_active_energy",
+        "Wh",
+    ),
+    ("ess_charge_energy", "ESS Charge Energy", "ess_charge_energy", "Wh"),
+    (
+        "ess_discharge_energy",
+        "ESS Discharge Energy",
+        "ess_discharge_energy",
+        "Wh",
+    ),
+    (
+        "optimisation_savings",
+        "Optimisation Savings",
+        "optimised_energy_total_savings",
+        "currency",
+    ),
+)
+_PERIOD_METERS: tuple[tuple[str, str, str, str, str], ...] = tuple(
+    (
+        f"{period}_{key}",
+        f"{period.capitalize()} {name}",
+        source_key,
+        source_unit,
+        period,
+    )
+    for period in ("hourly", "daily")
+    for key, name, source_key, source_unit in _PERIOD_SOURCES
+) + tuple(
+    (
+        f"{period}_optimisation_savings",
+        f"{period.capitalize()} Optimisation Savings",
+        "optimised_energy_total_savings",
+        "currency",
+        period,
+    )
+    for period in ("weekly", "monthly")
+)
+
+# Descriptions are static, so build them once and share them across entries.
+# Currency-valued ones get a per-entry copy in async_setup_entry.
+_BASE_DESCRIPTIONS: dict[str, SolarCubeSensorEntityDescription] = {
+    definition["key"]: SolarCubeSensorEntityDescription(
+        key=definition["key"],
+        name=definition["name"],
+        native_unit_of_measurement=definition.get("unit"),
+        device_class=definition.get("device_class"),
+        state_class=definition.get("state_class"),
+    )
+    for definition in SENSOR_DEFINITIONS
+}
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
     discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
-    await _async_cleanup_orphaned_entities(hass)
+    domain_data = hass.data[DOMAIN]
+    # Guard: only run once per HA runtime (reset when the last entry unloads,
+    # so a re-install still cleans up before its entities register). At boot
+    # the stale entries no longer affect entity_ids, so wait for startup.
+    if not domain_data.get("orphaned_entities_cleaned"):
+        domain_data["orphaned_entities_cleaned"] = True
+        if hass.is_running:
+            await _async_cleanup_orphaned_entities(hass)
+        else:
+            async_at_started(hass, _async_cleanup_orphaned_entities)
 
     hass_currency_raw = getattr(hass.config, "currency", None)
     hass_currency = (
@@ -91,487 +271,329 @@ async def async_setup_entry(
         else None
     )
 
-    data = hass.data[DOMAIN][entry.entry_id]
+    data = domain_data[entry.entry_id]
+    prefix = _unique_id_prefix(entry)
+    title = entry.title
     data_coordinator: SolarCubeDataCoordinator = data["data_coordinator"]
-    forecast_coordinator: SolarCubeForecastCoordinator = data[
-        "forecast_coordinator"
-    ]
-    optimal_coordinator: SolarCubeOptimalActionsCoordinator = data[
-        "optimal_coordinator"
-    ]
-
-    sensors: list[SensorEntity] = []
-    for definition in data_coordinator.sensor_definitions:
-        unit = definition.get("unit")
-        device_class = definition.get("device_class")
-        if unit == "currency":
-            unit = hass_currency
-            # Only mark as monetary if HA currency is configured.
-            if unit is None:
-                device_class = None
-        description = SolarCubeSensorEntityDescription(
-            key=definition["key"],
-            name=definition["name"],
-            native_unit_of_measurement=unit,
-            device_class=device_class,
-            state_class=definition.get("state_class"),
-        )
-        sensors.append(
-            SolarCubeValueSensor(
-                data_coordinator, description, entry, definition
+    agents_coordinator: SolarCubeAgentsCoordinator = data["agents_coordinator"]
+
+    def value_sensors() -> Iterator[SensorEntity]:
+        for definition in data_coordinator.sensor_definitions:
+            description = _BASE_DESCRIPTIONS[definition["key"]]
+            if description.native_unit_of_measurement == "currency":
+                description = replace(
+                    description,
+                    native_unit_of_measurement=hass_currency,
+                    # Only mark as monetary if HA currency is configured.
+                    device_class=(
+                        description.device_class
+                        if hass_currency is not None
+                        else None
+                    ),
+                )
+            yield SolarCubeValueSensor(
+                data_coordinator,
+                description,
+                prefix,
+                definition,
+                name=f"{title} {description.name}",
             )
-        )
 
-    sensors.append(SolarCubeForecastSensor(forecast_coordinator, entry))
-    sensors.append(SolarCubeOptimalActionsSensor(optimal_coordinator, entry))
+    summary_sensors = (
+        SolarCubeForecastSensor(
+            agents_coordinator, prefix, name=f"{title} Energy Forecast"
+        ),
+        SolarCubeOptimalActionsSensor(
+            agents_coordinator, prefix, name=f"{title} Optimal Actions"
+        ),
+    )
 
     # Derived monetary totals used by the shipped dashboards.
-    sensors.extend(
-        [
-            SolarCubeTotalValueFromPriceSensor(
-                data_coordinator,
-                entry,
-                key="grid_buy_active_energy_total_cost",
-                name="Grid Buy Active Energy Total Cost",
-                energy_source_key="grid_buy_active_energy",
-                price_key="buy_energy_price",
-                currency=hass_currency,
-            ),
-            SolarCubeTotalValueFromPriceSensor(
-                data_coordinator,
-                entry,
-                key="grid_sell_active_energy_total_compensation",
-                name="Grid Sell Active Energy Total Compensation",
-                energy_source_key="grid_sell_active_energy",
-                price_key="sell_energy_price",
-                currency=hass_currency,
-            ),
-        ]
+    price_totals = (
+        SolarCubeTotalValueFromPriceSensor(
+            data_coordinator,
+            prefix,
+            key="grid_buy_active_energy_total_cost",
+            name="Grid Buy Active Energy Total Cost",
+            energy_source_key="grid_buy_active_energy",
+            price_key="buy_energy_price",
+            currency=hass_currency,
+        ),
+        SolarCubeTotalValueFromPriceSensor(
+            data_coordinator,
+            prefix,
+            key="grid_sell_active_energy_total_compensation",
+            name="Grid Sell Active Energy Total Compensation",
+            energy_source_key="grid_sell_active_energy",
+            price_key="sell_energy_price",
+            currency=hass_currency,
+        ),
     )
 
-    # Derived/template-like forecast point sensors.
-    sensors.extend(
-        [
-            SolarCubeForecastPointSensor(
-                forecast_coordinator,
-                entry,
-                key="forecasted_production_1h",
-                name="SolarCube Forecasted Production 1H",
-                index=3,
-                value_key="pf",
-            ),
-            SolarCubeForecastPointSensor(
-                forecast_coordinator,
-                entry,
-                key="forecasted_consumption_1h",
-                name="SolarCube Forecasted Consumption 1H",
-                index=3,
-                value_key="cf",
-            ),
-            SolarCubeForecastPointSensor(
-                forecast_coordinator,
-                entry,
-                key="soc_forecast_1h",
-                name="SolarCube SoC Forecast 1H",
-                index=3,
-                value_key="sf",
-            ),
-            SolarCubeForecastPointSensor(
-                forecast_coordinator,
-                entry,
-                key="forecasted_production_6h",
-                name="SolarCube Forecasted Production 6H",
-                index=23,
-                value_key="pf",
-            ),
-            SolarCubeForecastPointSensor(
-                forecast_coordinator,
-                entry,
-                key="forecasted_consumption_6h",
-                name="SolarCube Forecasted Consumption 6H",
-                index=23,
-                value_key="cf",
-            ),
-            SolarCubeForecastPointSensor(
-                forecast_coordinator,
-                entry,
-                key="soc_forecast_6h",
-                name="SolarCube SoC Forecast 6H",
-                index=23,
-                value_key="sf",
-            ),
-        ]
+    # Derived/template-like forecast and optimal action point sensors.
+    forecast_points = (
+        SolarCubeSeriesPointSensor(
+            agents_coordinator,
+            prefix,
+            series="forecast",
+            key=key,
+            name=name,
+            index=index,
+            value_key=value_key,
+        )
+        for key, name, index, value_key in _FORECAST_POINTS
     )
-
-    # Derived/template-like optimal action point sensors.
-    for horizon_key, idx in (("1h", 3), ("6h", 23)):
-        sensors.extend(
-            [
-                SolarCubeOptimalActionPointSensor(
-                    optimal_coordinator,
-                    entry,
-                    key=f"optimal_gb_{horizon_key}",
-                    name=f"SolarCube Optimal GB {horizon_key.upper()}",
-                    index=idx,
-                    value_key="gb",
-                ),
-                SolarCubeOptimalActionPointSensor(
-                    optimal_coordinator,
-                    entry,
-                    key=f"optimal_bg_{horizon_key}",
-                    name=f"SolarCube Optimal BG {horizon_key.upper()}",
-                    index=idx,
-                    value_key="bg",
-                ),
-                SolarCubeOptimalActionPointSensor(
-                    optimal_coordinator,
-                    entry,
-                    key=f"optimal_bc_{horizon_key}",
-                    name=f"SolarCube Optimal BC {horizon_key.upper()}",
-                    index=idx,
-                    value_key="bc",
-                ),
-                SolarCubeOptimalActionPointSensor(
-                    optimal_coordinator,
-                    entry,
-                    key=f"optimal_gc_{horizon_key}",
-                    name=f"SolarCube Optimal GC {horizon_key.upper()}",
-                    index=idx,
-                    value_key="gc",
-                ),
-                SolarCubeOptimalActionPointSensor(
-                    optimal_coordinator,
-                    entry,
-                    key=f"optimal_pb_{horizon_key}",
-                    name=f"SolarCube Optimal PB {horizon_key.upper()}",
-                    index=idx,
-                    value_key="pb",
-                ),
-                SolarCubeOptimalActionPointSensor(
-                    optimal_coordinator,
-                    entry,
-                    key=f"optimal_pc_{horizon_key}",
-                    name=f"SolarCube Optimal PC {horizon_key.upper()}",
-                    index=idx,
-                    value_key="pc",
-                ),
-                SolarCubeOptimalActionPointSensor(
-                    optimal_coordinator,
-                    entry,
-                    key=f"optimal_pg_{horizon_key}",
-                    name=f"SolarCube Optimal PG {horizon_key.upper()}",
-                    index=idx,
-                    value_key="pg",
-                ),
-            ]
+    optimal_points = (
+        SolarCubeSeriesPointSensor(
+            agents_coordinator,
+            prefix,
+            series="actions",
+            key=key,
+            name=name,
+            index=index,
+            value_key=value_key,
         )
+        for key, name, index, value_key in _OPTIMAL_POINTS
+    )
 
     # Wh → kWh totals (equivalent to the YAML template sensors).
-    kwh_totals: list[tuple[str, str, str]] = [
-        (
-            "ess_discharged_energy",
-            "ESS Discharged Energy",
-            "ess_discharge_energy",
-        ),
-        ("ess_charged_energy", "ESS Charged Energy", "ess_charge_energy"),
-        (
-            "grid_buy_active_energy_total",
-            "Grid Buy Active Energy Total",
-            "grid_buy_active_energy",
-        ),
-        (
-            "grid_sell_active_energy_total",
-            "Grid Sell Active Energy Total",
-            "grid_sell_active_energy",
-        ),
-        (
-            "pv_active_energy_total",
-            "PV Active Energy Total",
-            "pv_active_energy",
-        ),
-        (
-            "consumption_active_energy_total",
-            "Consumption Active Energy Total",
-            "consumption_active_energy",
-        ),
-    ]
-    for key, name, source_key in kwh_totals:
-        sensors.append(
-            SolarCubeKwhTotalSensor(
-                data_coordinator,
-                entry,
-                key=key,
-                name=name,
-                source_key=source_key,
-            )
+    kwh_sensors = (
+        SolarCubeKwhTotalSensor(
+            data_coordinator,
+            prefix,
+            key=key,
+            name=name,
+            source_key=source_key,
         )
+        for key, name, source_key in _KWH_TOTALS
+    )
 
     # Period meters (replacement for utility_meter + alias templates).
-    for period in ("hourly", "daily"):
-        sensors.extend(
-            [
-                SolarCubePeriodMeterSensor(
-                    data_coordinator,
-                    entry,
-                    key=f"{period}_grid_sell_energy",
-                    name=f"{period.capitalize()} Grid Sell Energy",
-                    source_key="grid_sell_active_energy",
-                    source_unit="Wh",
-                    unit="kWh",
-                    period=period,
-                ),
-                SolarCubePeriodMeterSensor(
-                    data_coordinator,
-                    entry,
-                    key=f"{period}_grid_buy_energy",
-                    name=f"{period.capitalize()} Grid Buy Energy",
-                    source_key="grid_buy_active_energy",
-                    source_unit="Wh",
-                    unit="kWh",
-                    period=period,
-                ),
-                SolarCubePeriodMeterSensor(
-                    data_coordinator,
-                    entry,
-                    key=f"{period}_pv_energy",
-                    name=f"{period.capitalize()} PV Energy",
-                    source_key="pv_active_energy",
-                    source_unit="Wh",
-                    unit="kWh",
-                    period=period,
-                ),
-                SolarCubePeriodMeterSensor(
-                    data_coordinator,
-                    entry,
-                    key=f"{period}_consumption_energy",
-                    name=f"{period.capitalize()} Consumption Energy",
-                    source_key="consumption_active_energy",
-                    source_unit="Wh",
-                    unit="kWh",
-                    period=period,
-                ),
-                SolarCubePeriodMeterSensor(
-                    data_coordinator,
-                    entry,
-                    key=f"{period}_ess_charge_energy",
-                    name=f"{period.capitalize()} ESS Charge Energy",
-                    source_key="ess_charge_energy",
-                    source_unit="Wh",
-                    unit="kWh",
-                    period=period,
-                ),
-                SolarCubePeriodMeterSensor(
-                    data_coordinator,
-                    entry,
-                    key=f"{period}_ess_discharge_energy",
-                    name=f"{period.capitalize()} ESS Discharge Energy",
-                    source_key="ess_discharge_energy",
-                    source_unit="Wh",
-                    unit="kWh",
-                    period=period,
-                ),
-                SolarCubePeriodMeterSensor(
-                    data_coordinator,
-                    entry,
-                    key=f"{period}_optimisation_savings",
-                    name=f"{period.capitalize()} Optimisation Savings",
-                    source_key="optimised_energy_total_savings",
-                    source_unit="currency",
-                    unit=hass_currency,
-                    period=period,
-                ),
-            ]
+    period_meters = (
+        SolarCubePeriodMeterSensor(
+            data_coordinator,
+            prefix,
+            key=key,
+            name=name,
+            source_key=source_key,
+            source_unit=source_unit,
+            unit="kWh" if source_unit == "Wh" else hass_currency,
+            period=period,
         )
+        for key, name, source_key, source_unit, period in _PERIOD_METERS
+    )
 
-    sensors.extend(
-        [
-            SolarCubePeriodMeterSensor(
-                data_coordinator,
-                entry,
-                key="weekly_optimisation_savings",
-                name="Weekly Optimisation Savings",
-                source_key="optimised_energy_total_savings",
-                source_unit="currency",
-                unit=hass_currency,
-                period="weekly",
-            ),
-            SolarCubePeriodMeterSensor(
-                data_coordinator,
-                entry,
-                key="monthly_optimisation_savings",
-                name="Monthly Optimisation Savings",
-                source_key="optimised_energy_total_savings",
-                source_unit="currency",
-                unit=hass_currency,
-                period="monthly",
-            ),
-        ]
+    # Coordinators already hold data from their first refresh, so there is
+    # nothing to fetch per entity at add time.
+    async_add_entities(
+        list(
+            chain(
+                value_sensors(),
+                summary_sensors,
+                price_totals,
+                forecast_points,
+                optimal_points,
+                kwh_sensors,
+                period_meters,
+            )
+        ),
+        update_before_add=False,
     )
 
-    async_add_entities(sensors)
 
+class _SolarCubeCachedDataEntity(CoordinatorEntity[SolarCubeDataCoordinator]):
+    """Data coordinator entity that recomputes its state only on new input.
 
-class SolarCubeValueSensor(
-    CoordinatorEntity[SolarCubeDataCoordinator], SensorEntity
-):
+    Subclasses implement ``_source()`` returning the raw readings the state
+    is derived from and ``_compute(source)`` turning them into the native
+    value. Ticks that deliver the same readings skip the recompute and, as
+    long as availability is unchanged, the state write.
+    """
+
+    __slots__ = ("_cached_source", "_written_available")
+
+    def __init__(self, coordinator: SolarCubeDataCoordinator) -> None:
+        super().__init__(coordinator)
+        self._cached_source: Any = _UNSET
+        self._written_available = True
+
+    @abc.abstractmethod
+    def _source(self) -> Any:
+        """Return the raw readings the state is derived from."""
+
+    @abc.abstractmethod
+    def _compute(self, source: Any) -> Any:
+        """Return the native value for the given readings."""
+
+    def _refresh_native_value(self) -> bool:
+        source = self._source()
+        cached = self._cached_source
+        if source is cached or source == cached:
+            return False
+        self._cached_source = source
+        self._attr_native_value = self._compute(source)
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        changed = self._refresh_native_value()
+        available = self.available
+        if changed or available is not self._written_available:
+            self._written_available = available
+            self.async_write_ha_state()
+
+
+class SolarCubeValueSensor(_SolarCubeCachedDataEntity, SensorEntity):
     """Representation of a scalar InfluxDB-backed sensor."""
 
+    __slots__ = ("_definition",)
+
     _attr_should_poll = False
+    _round = staticmethod(_round_float)
 
     def __init__(
         self,
         coordinator: SolarCubeDataCoordinator,
         description: SolarCubeSensorEntityDescription,
-        entry: ConfigEntry,
+        prefix: str,
         definition: dict[str, Any],
+        *,
+        name: str,
     ) -> None:
         super().__init__(coordinator)
         self.entity_description = description
         self._definition = definition
-        prefix = _unique_id_prefix(entry)
         self._attr_unique_id = f"{prefix}_{description.key}"
-        self._attr_name = f"{entry.title} {description.name}"
+        self._attr_name = name
+        self._refresh_native_value()
 
-    @property
-    def native_value(self):
-        val = self.coordinator.data.get(self.entity_description.key)
+    def _source(self) -> Any:
+        data = self.coordinator.data
+        return data.get(self.entity_description.key) if data else None
+
+    def _compute(self, val: Any) -> Any:
         if val is not None and (division := self._definition.get("division")):
             try:
                 val = float(val) / division
             except (TypeError, ValueError):
                 pass
-        return _round_float(val)
+        return self._round(val)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # last_refresh moves on every tick, so the state is always written;
+        # only the value conversion is skipped for an unchanged reading.
+        self._refresh_native_value()
+        self.async_write_ha_state()
 
     @property
     def extra_state_attributes(self):
-        return {"last_refresh": self.coordinator.data.get("_last_update")}
+        return {"last_refresh": self.coordinator.last_update_iso}
 
 
 class SolarCubeForecastSensor(
-    CoordinatorEntity[SolarCubeForecastCoordinator], SensorEntity
+    CoordinatorEntity[SolarCubeAgentsCoordinator], SensorEntity
 ):
     """Sensor exposing forecast payload as attribute."""
 
+    __slots__ = ()
+
     _attr_icon = "mdi:weather-sunny-alert"
     _attr_should_poll = False
 
     def __init__(
-        self, coordinator: SolarCubeForecastCoordinator, entry: ConfigEntry
+        self, coordinator: SolarCubeAgentsCoordinator, prefix: str, *, name: str
     ) -> None:
         super().__init__(coordinator)
-        prefix = _unique_id_prefix(entry)
         self._attr_unique_id = f"{prefix}_forecast"
-        self._attr_name = f"{entry.title} Energy Forecast"
+        self._attr_name = name
+        self._update_from_data()
 
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return None
-        return len(self.coordinator.data)
+    def _update_from_data(self) -> None:
+        data = self.coordinator.data
+        forecast = data.get("forecast") if data else None
+        self._attr_native_value = len(forecast) if forecast else None
+        self._attr_extra_state_attributes = {"forecast": forecast}
 
-    @property
-    def extra_state_attributes(self):
-        return {"forecast": self.coordinator.data}
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_from_data()
+        super()._handle_coordinator_update()
 
 
 class SolarCubeOptimalActionsSensor(
-    CoordinatorEntity[SolarCubeOptimalActionsCoordinator], SensorEntity
+    CoordinatorEntity[SolarCubeAgentsCoordinator], SensorEntity
 ):
     """Sensor exposing optimal actions as attribute."""
 
-    _attr_icon = "mdi:lightning-bolt"
-    _attr_should_poll = False
-
-    def __init__(
-        self,
-        coordinator: SolarCubeOptimalActionsCoordinator,
-        entry: ConfigEntry,
-    ) -> None:
-        super().__init__(coordinator)
-        prefix = _unique_id_prefix(entry)
-        self._attr_unique_id = f"{prefix}_optimal_actions"
-        self._attr_name = f"{entry.title} Optimal Actions"
+    __slots__ = ()
 
-    @property
-    def native_value(self):
-        if not self.coordinator.data:
-            return None
-        return len(self.coordinator.data)
-
-    @property
-    def extra_state_attributes(self):
-        return {"optimal_actions": self.coordinator.data}
-
-
-class SolarCubeForecastPointSensor(
-    CoordinatorEntity[SolarCubeForecastCoordinator], SensorEntity
-):
+    _attr_icon = "mdi:lightning-bolt"
     _attr_should_poll = False
 
     def __init__(
         self,
-        coordinator: SolarCubeForecastCoordinator,
-        entry: ConfigEntry,
+        coordinator: SolarCubeAgentsCoordinator,
+        prefix: str,
         *,
-        key: str,
         name: str,
-        index: int,
-        value_key: str,
     ) -> None:
         super().__init__(coordinator)
-        self._index = index
-        self._value_key = value_key
-        prefix = _unique_id_prefix(entry)
-        self._attr_unique_id = f"{prefix}_{key}"
+        self._attr_unique_id = f"{prefix}_optimal_actions"
         self._attr_name = name
+        self._update_from_data()
 
-    @property
-    def native_value(self):
+    def _update_from_data(self) -> None:
         data = self.coordinator.data
-        if not data or len(data) <= self._index:
-            return None
-        item = data[self._index]
-        if not isinstance(item, dict):
-            return None
-        return _round_float(item.get(self._value_key))
+        actions = data.get("actions") if data else None
+        self._attr_native_value = len(actions) if actions else None
+        self._attr_extra_state_attributes = {"optimal_actions": actions}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_from_data()
+        super()._handle_coordinator_update()
 
 
-class SolarCubeOptimalActionPointSensor(
-    CoordinatorEntity[SolarCubeOptimalActionsCoordinator], SensorEntity
+class SolarCubeSeriesPointSensor(
+    CoordinatorEntity[SolarCubeAgentsCoordinator], SensorEntity
 ):
+    """Single value taken from one row of the forecast or actions series."""
+
+    __slots__ = ("_series", "_index", "_value_key")
+
     _attr_should_poll = False
+    _round = staticmethod(_round_float)
 
     def __init__(
         self,
-        coordinator: SolarCubeOptimalActionsCoordinator,
-        entry: ConfigEntry,
+        coordinator: SolarCubeAgentsCoordinator,
+        prefix: str,
         *,
         key: str,
         name: str,
+        series: str,
         index: int,
         value_key: str,
     ) -> None:
         super().__init__(coordinator)
+        self._series = series
         self._index = index
         self._value_key = value_key
-        prefix = _unique_id_prefix(entry)
         self._attr_unique_id = f"{prefix}_{key}"
         self._attr_name = name
 
     @property
     def native_value(self):
-        data = self.coordinator.data
-        if not data or len(data) <= self._index:
-            return None
-        item = data[self._index]
-        if not isinstance(item, dict):
+        item = self.coordinator.point(self._series, self._index)
+        if item is None:
             return None
-        return _round_float(item.get(self._value_key))
+        return self._round(item.get(self._value_key))
 
 
-class SolarCubeKwhTotalSensor(
-    CoordinatorEntity[SolarCubeDataCoordinator], SensorEntity
-):
+class SolarCubeKwhTotalSensor(_SolarCubeCachedDataEntity, SensorEntity):
+    __slots__ = ("_source_key",)
+
     _attr_should_poll = False
     _attr_native_unit_of_measurement = "kWh"
     _attr_device_class = "energy"
@@ -580,7 +602,7 @@ class SolarCubeKwhTotalSensor(
     def __init__(
         self,
         coordinator: SolarCubeDataCoordinator,
-        entry: ConfigEntry,
+        prefix: str,
         *,
         key: str,
         name: str,
@@ -588,13 +610,15 @@ class SolarCubeKwhTotalSensor(
     ) -> None:
         super().__init__(coordinator)
         self._source_key = source_key
-        prefix = _unique_id_prefix(entry)
         self._attr_unique_id = f"{prefix}_{key}"
         self._attr_name = name
+        self._refresh_native_value()
 
-    @property
-    def native_value(self):
-        raw = self.coordinator.data.get(self._source_key)
+    def _source(self) -> Any:
+        data = self.coordinator.data
+        return data.get(self._source_key) if data else None
+
+    def _compute(self, raw: Any) -> float | None:
         try:
             value = float(raw)
         except (TypeError, ValueError):
@@ -602,18 +626,27 @@ class SolarCubeKwhTotalSensor(
         # Match the YAML templates: treat non-positive as unavailable.
         if value <= 0:
             return None
-        return round(value / 1000.0, 5)
+        return round(value * 0.001, 5)
 
 
 class SolarCubePeriodMeterSensor(
-    CoordinatorEntity[SolarCubeDataCoordinator], RestoreEntity, SensorEntity
+    _SolarCubeCachedDataEntity, RestoreEntity, SensorEntity
 ):
+    __slots__ = (
+        "_source_key",
+        "_scale",
+        "_period",
+        "_baseline",
+        "_last_total",
+        "_period_key",
+    )
+
     _attr_should_poll = False
 
     def __init__(
         self,
         coordinator: SolarCubeDataCoordinator,
-        entry: ConfigEntry,
+        prefix: str,
         *,
         key: str,
         name: str,
@@ -624,30 +657,39 @@ class SolarCubePeriodMeterSensor(
     ) -> None:
         super().__init__(coordinator)
         self._source_key = source_key
-        self._source_unit = source_unit
+        # Wh readings shown in kWh are scaled down; everything else passes
+        # through unchanged.
+        self._scale = 0.001 if source_unit == "Wh" and unit == "kWh" else 1.0
         self._period = period
         self._attr_native_unit_of_measurement = unit
-        prefix = _unique_id_prefix(entry)
         self._attr_unique_id = f"{prefix}_{key}"
         self._attr_name = name
         self._baseline: float | None = None
         self._last_total: float | None = None
         self._period_key: str | None = None
-        self._attr_extra_state_attributes = {}
+        self._attr_extra_state_attributes = {
+            "_period_key": None,
+            "_baseline": None,
+            "_last_total": None,
+        }
 
         if unit in ("kWh", "Wh"):
             self._attr_device_class = "energy"
             self._attr_state_class = "total"
-        elif self._source_unit == "currency" and unit:
+        elif source_unit == "currency" and unit:
             self._attr_device_class = "monetary"
             self._attr_state_class = "total"
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
         last = await self.async_get_last_state()
-        if not last:
-            return
-        attrs = last.attributes or {}
+        if last:
+            self._restore(last.attributes or {})
+        # The baseline comes from the restored state, so the first value can
+        # only be derived once it is back.
+        self._refresh_native_value()
+
+    def _restore(self, attrs: Mapping[str, Any]) -> None:
         try:
             baseline_raw = attrs.get("_baseline")
             self._baseline = (
@@ -669,56 +711,34 @@ class SolarCubePeriodMeterSensor(
         pk = attrs.get("_period_key")
         self._period_key = pk if isinstance(pk, str) else None
 
-    def _current_period_key(self) -> str:
-        now = dt_util.now()
-        local_now = dt_util.as_local(now)
+    def _sync_attributes(self) -> None:
+        # Updated in place; Home Assistant copies the attributes on write.
+        attrs = self._attr_extra_state_attributes
+        attrs["_period_key"] = self._period_key
+        attrs["_baseline"] = self._baseline
+        attrs["_last_total"] = self._last_total
 
-        if self._period == "hourly":
-            start = local_now.replace(minute=0, second=0, microsecond=0)
-        elif self._period == "daily":
-            start = local_now.replace(
-                hour=0, minute=0, second=0, microsecond=0
-            )
-        elif self._period == "weekly":
-            # Week starts Sunday 00:00 local (matches the provided cron: 0 0 * * 7).
-            days_since_sunday = (local_now.weekday() + 1) % 7
-            d = (local_now - timedelta(days=days_since_sunday)).date()
-            start = datetime(d.year, d.month, d.day, tzinfo=local_now.tzinfo)
-        elif self._period == "monthly":
-            start = local_now.replace(
-                day=1, hour=0, minute=0, second=0, microsecond=0
-            )
-        else:
-            start = local_now
-        return start.isoformat()
-
-    def _convert(self, value: float) -> float:
-        if (
-            self._source_unit == "Wh"
-            and self._attr_native_unit_of_measurement == "kWh"
-        ):
-            return value / 1000.0
-        return value
+    def _source(self) -> tuple[Any, str]:
+        # The period key is part of the input so a rollover is never skipped.
+        data = self.coordinator.data
+        return (
+            data.get(self._source_key) if data else None,
+            _period_key(self._period),
+        )
 
-    @property
-    def native_value(self):
-        raw_total = self.coordinator.data.get(self._source_key)
+    def _compute(self, source: tuple[Any, str]) -> float | None:
+        raw_total, pk = source
         try:
             total = float(raw_total)
         except (TypeError, ValueError):
             return None
 
-        pk = self._current_period_key()
         if self._period_key != pk or self._baseline is None:
             # Start of a new period (or first run).
             self._period_key = pk
             self._baseline = total
             self._last_total = total
-            self._attr_extra_state_attributes = {
-                "_period_key": self._period_key,
-                "_baseline": self._baseline,
-                "_last_total": self._last_total,
-            }
+            self._sync_attributes()
             return 0.0
 
         # Handle counter resets.
@@ -727,19 +747,17 @@ class SolarCubePeriodMeterSensor(
 
         self._last_total = total
         delta = total - (self._baseline or total)
-        out = self._convert(delta)
+        out = delta * self._scale
 
-        self._attr_extra_state_attributes = {
-            "_period_key": self._period_key,
-            "_baseline": self._baseline,
-            "_last_total": self._last_total,
-        }
+        self._sync_attributes()
         return round(max(out, 0.0), 5)
 
 
 class SolarCubeTotalValueFromPriceSensor(
-    CoordinatorEntity[SolarCubeDataCoordinator], SensorEntity
+    _SolarCubeCachedDataEntity, SensorEntity
 ):
+    __slots__ = ("_energy_source_key", "_price_key")
+
     _attr_should_poll = False
     _attr_state_class = "total"
     _attr_device_class = "monetary"
@@ -747,7 +765,7 @@ class SolarCubeTotalValueFromPriceSensor(
     def __init__(
         self,
         coordinator: SolarCubeDataCoordinator,
-        entry: ConfigEntry,
+        prefix: str,
         *,
         key: str,
         name: str,
@@ -758,19 +776,23 @@ class SolarCubeTotalValueFromPriceSensor(
         super().__init__(coordinator)
         self._energy_source_key = energy_source_key
         self._price_key = price_key
-        prefix = _unique_id_prefix(entry)
         self._attr_unique_id = f"{prefix}_{key}"
         self._attr_name = name
         # Use Home Assistant configured currency (ISO 4217 code, e.g. PLN/EUR/USD).
         self._attr_native_unit_of_measurement = currency
         if currency is None:
             self._attr_device_class = None
+        self._refresh_native_value()
 
-    @property
-    def native_value(self):
-        raw_energy_wh = self.coordinator.data.get(self._energy_source_key)
-        raw_price = self.coordinator.data.get(self._price_key)
+    def _source(self) -> tuple[Any, Any]:
+        data = self.coordinator.data
+        if not data:
+            return (None, None)
+        get = data.get
+        return (get(self._energy_source_key), get(self._price_key))
 
+    def _compute(self, source: tuple[Any, Any]) -> float | None:
+        raw_energy_wh, raw_price = source
         try:
             energy_wh = float(raw_energy_wh)
             price_per_kwh = float(raw_price)
@@ -780,5 +802,5 @@ class SolarCubeTotalValueFromPriceSensor(
         if energy_wh <= 0:
             return None
 
-        value = (energy_wh / 1000.0) * price_per_kwh
+        value = energy_wh * 0.001 * price_per_kwh
         return round(value, 5)